@@ -4,13 +4,17 @@ import os
 from datetime import datetime
 from scraper import PelandoScraper
 from telegram_bot import TelegramBot
+from price_history import PriceHistory, canonical_product_key, parse_price_cents
 
 class OfferBot:
-    def __init__(self, bot_token: str, chat_id: str):
-        self.scraper = PelandoScraper()
+    def __init__(self, bot_token: str, chat_id: str, feeds=None):
+        self.scraper = PelandoScraper(feeds)
         self.telegram_bot = TelegramBot(bot_token, chat_id)
         self.sent_offers_file = "sent_offers.json"
         self.sent_offers = self.load_sent_offers()
+        self.price_history = PriceHistory("price_history.db")
+        # Observações mínimas antes de usar a mediana para descartar ofertas
+        self.min_price_observations = 5
     
     def load_sent_offers(self):
         """Carrega a lista de ofertas já enviadas"""
@@ -34,12 +38,37 @@ class OfferBot:
         """Gera um ID único para a oferta baseado no título e preço"""
         return f"{offer['title']}_{offer['price']}".replace(' ', '_').lower()
     
+    def check_price_history(self, offer):
+        """Registra o preço da oferta e indica se é um desconto real"""
+        cents = parse_price_cents(offer['price'])
+        if cents is None:
+            return True
+        
+        key = canonical_product_key(offer)
+        stats = self.price_history.stats(key)
+        self.price_history.record(key, cents)
+        
+        if not stats:
+            return True
+        
+        # Menor preço já visto para o produto
+        if cents < stats['min']:
+            offer['historic_low'] = True
+        
+        # Com histórico suficiente, acima da mediana não é desconto de verdade
+        if stats['count'] < self.min_price_observations:
+            return True
+        return cents <= stats['median']
+    
     async def check_and_send_new_offers(self, max_offers=10):
         """Verifica novas ofertas e envia as que ainda não foram enviadas"""
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Iniciando verificação de ofertas...")
         
-        # Faz o scraping das ofertas
-        offers = await self.scraper.scrape_offers(max_offers)
+        # Faz o scraping das ofertas, ignorando as já enviadas antes do limite
+        offers = await self.scraper.scrape_offers(
+            max_offers,
+            skip_offer=lambda offer: self.generate_offer_id(offer) in self.sent_offers
+        )
         
         if not offers:
             print("Nenhuma oferta encontrada.")
@@ -48,6 +77,10 @@ class OfferBot:
         # Filtra ofertas novas
         new_offers = []
         for offer in offers:
+            if not self.check_price_history(offer):
+                print(f"Oferta acima do preço histórico ignorada: '{offer['title']}'")
+                continue
+            
             offer_id = self.generate_offer_id(offer)
             if offer_id not in self.sent_offers:
                 new_offers.append(offer)
@@ -87,7 +120,7 @@ async def main():
     CHAT_ID = "-1002593394513"
     
     # Cria o bot
-    bot = OfferBot(BOT_TOKEN, CHAT_ID)
+    bot = OfferBot(BOT_TOKEN, CHAT_ID, feeds=["/", "/recentes"])
     
     # Execução única para teste
     print("=== EXECUÇÃO DE TESTE ===")
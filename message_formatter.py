@@ -0,0 +1,153 @@
+import html
+import re
+import string
+import time
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Limites da Bot API (contados no texto visível, após o parsing do HTML)
+CAPTION_LIMIT = 1024
+TEXT_LIMIT = 4096
+
+ELLIPSIS = "…"
+
+HISTORIC_LOW_BADGE = "📉 <b>Menor preço histórico!</b>\n"
+
+DEFAULT_TEMPLATE = """{badge}🔥 <b>{title}</b>
+
+💰 <b>Preço:</b> {price}
+🏪 <b>Loja:</b> {store}
+🌡️ <b>Temperatura:</b> {temperature}
+⏰ <b>Postado:</b> {timestamp}
+
+🔗 <a href="{link}">Ver oferta completa</a>
+
+#oferta #promocao #{hashtag}"""
+
+_TAG_RE = re.compile(r'<[^>]*>')
+
+def _telegram_len(text: str) -> int:
+    """Tamanho do texto como o Telegram conta (unidades UTF-16)"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def visible_len(markup: str) -> int:
+    """Tamanho do texto visível: sem tags (nem href) e com entidades decodificadas"""
+    return _telegram_len(html.unescape(_TAG_RE.sub('', markup)))
+
+
+def _escape(text) -> str:
+    """Escapa texto para o parse_mode HTML do Telegram"""
+    return html.escape(str(text or ""), quote=False)
+
+
+@lru_cache(maxsize=1024)
+def normalize_hashtag(store: str) -> str:
+    """Converte o nome da loja em hashtag válida (ex: 'Mercado Livre' -> 'mercadolivre')"""
+    return re.sub(r'\W+', '', store.lower())
+
+
+class OfferFormatter:
+    def __init__(self, template: str = DEFAULT_TEMPLATE):
+        self.template = template
+        self._render = template.format_map
+
+        # Pré-compila o template: tamanho visível do texto literal e quantas
+        # vezes cada campo aparece fora de tags (campos em atributos, como o
+        # href do link, não contam no limite)
+        markup = ""
+        self._field_counts = {}
+        for literal, field, _, _ in string.Formatter().parse(template):
+            markup += literal
+            if field is not None:
+                if markup.rfind('<') <= markup.rfind('>'):
+                    self._field_counts[field] = self._field_counts.get(field, 0) + 1
+        self._literal_len = visible_len(markup)
+
+    def format(self, offer: Dict, limit: int = TEXT_LIMIT) -> Optional[str]:
+        """Formata a oferta respeitando o limite de caracteres informado.
+
+        Retorna None se os demais campos já excederem o limite ou não
+        deixarem espaço para o título.
+        """
+        store = offer.get('store') or ""
+        fields = {
+            'price': _escape(offer.get('price')),
+            'store': _escape(store),
+            'temperature': _escape(offer.get('temperature')),
+            'timestamp': _escape(offer.get('timestamp')),
+            'link': html.escape(offer.get('link') or "", quote=True),
+            'hashtag': normalize_hashtag(store),
+            'badge': HISTORIC_LOW_BADGE if offer.get('historic_low') else "",
+        }
+
+        # O título é o único campo truncado; os demais são curtos
+        used = self._literal_len
+        for field, count in self._field_counts.items():
+            if field != 'title':
+                used += visible_len(fields.get(field, "")) * count
+        title_count = self._field_counts.get('title', 0)
+        budget = (limit - used) // title_count if title_count else 0
+
+        title = offer.get('title') or ""
+        fitted_title = self._fit_title(title, budget)
+        if used > limit or (title and title_count and not fitted_title):
+            print(f"Mensagem excede {limit} caracteres mesmo sem título: '{title[:50]}'")
+            return None
+
+        fields['title'] = _escape(fitted_title)
+        return self._render(fields)
+
+    def _fit_title(self, title: str, budget: int) -> str:
+        """Trunca o título (ainda sem escape) no limite de palavra mais próximo"""
+        if _telegram_len(title) <= budget:
+            return title
+
+        budget -= len(ELLIPSIS)
+        if budget <= 0:
+            return ""
+
+        # Emojis fora do BMP ocupam 2 unidades; remove o excedente, se houver
+        truncated = title[:budget]
+        excess = _telegram_len(truncated) - budget
+        while excess > 0:
+            drop = -(-excess // 2)
+            truncated = truncated[:-drop]
+            excess = _telegram_len(truncated) - budget
+
+        # Evita cortar palavras no meio, desde que não perca muito texto
+        space = truncated.rfind(' ')
+        if space > len(truncated) // 2:
+            truncated = truncated[:space]
+
+        truncated = truncated.rstrip(" ,.-/")
+        return truncated + ELLIPSIS if truncated else ""
+
+
+# Benchmark da formatação
+def benchmark_formatter(total: int = 10000):
+    formatter = OfferFormatter()
+    stores = ['Mercado Livre', 'Amazon', 'AliExpress', 'Magazine Luiza', 'Nuuvem']
+    offers = [
+        {
+            'title': f'Oferta <{i}> & "Produto" ' + 'palavra ' * (i % 300),
+            'price': 'R$ 99,90',
+            'store': stores[i % len(stores)],
+            'temperature': f'{i % 500}°',
+            'timestamp': '5 min',
+            'link': f'https://www.pelando.com.br/d/oferta-{i}?a=1&b=2',
+        }
+        for i in range(total)
+    ]
+
+    start = time.perf_counter()
+    messages = [formatter.format(offer, CAPTION_LIMIT) for offer in offers]
+    elapsed = time.perf_counter() - start
+
+    too_long = sum(1 for message in messages if visible_len(message) > CAPTION_LIMIT)
+    print(f"{total} ofertas formatadas em {elapsed * 1000:.1f} ms "
+          f"({elapsed / total * 1e6:.1f} µs/oferta), {too_long} acima do limite")
+
+
+if __name__ == '__main__':
+    benchmark_formatter()
@@ -0,0 +1,215 @@
+import re
+import sqlite3
+import time
+import unicodedata
+from typing import Dict, Optional
+
+
+def parse_price_cents(price: str) -> Optional[int]:
+    """Converte o preço do Pelando ('R$\\n3.339', 'R$ 83,92') em centavos.
+
+    Selos que não começam com R$ ("40% OFF", "3x R$ 100", "Grátis") retornam None.
+    """
+    match = re.match(r'\s*R\$\s*(\d[\d.]*(?:,\d{1,2})?)', price or "")
+    if not match:
+        return None
+    reais, _, centavos = match.group(1).partition(',')
+    return int(reais.replace('.', '')) * 100 + int(centavos.ljust(2, '0'))
+
+
+def _normalize(text: str) -> str:
+    """Remove acentos, pontuação e espaços extras"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(re.findall(r'[a-z0-9]+', text))
+
+
+def canonical_product_key(offer: Dict) -> str:
+    """Chave canônica do produto: loja + título normalizado.
+
+    O link de afiliado não é usado: ele vem de uma busca e muda entre execuções.
+    """
+    store = _normalize(offer.get('store') or "")
+
+    # Remove prefixos como "[R$2329 moedas/BR]" ou "(STEAM)" do título
+    title = re.sub(r'^\s*(\[[^\]]*\]|\([^)]*\)|\s)+', '', offer.get('title') or "")
+    return f"{store}|{_normalize(title)}"
+
+
+class PriceHistory:
+    """Histórico de preços por produto em SQLite.
+
+    A tabela prices guarda só as mudanças de preço (produto, timestamp,
+    centavos); o último preço fica em products.last_cents. A tabela price_levels
+    guarda, para cada preço distinto do produto, quantas vezes ele foi
+    observado (repetições incluídas), e products.obs_count o total.
+
+    Mínimo é a primeira linha de price_levels (O(log n)). A mediana
+    ponderada percorre os preços distintos do produto em ordem até
+    acumular metade das observações: O(log n + k), com k preços distintos
+    daquele produto, e não o número de observações.
+    """
+
+    def __init__(self, db_file: str = "price_history.db"):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file)
+        self.conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS products (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                obs_count INTEGER NOT NULL DEFAULT 0,
+                last_cents INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS prices (
+                product_id INTEGER NOT NULL,
+                observed_at INTEGER NOT NULL,
+                cents INTEGER NOT NULL,
+                PRIMARY KEY (product_id, observed_at, cents)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS price_levels (
+                product_id INTEGER NOT NULL,
+                cents INTEGER NOT NULL,
+                n INTEGER NOT NULL,
+                PRIMARY KEY (product_id, cents)
+            ) WITHOUT ROWID;
+            DROP INDEX IF EXISTS prices_by_cents;
+        """)
+
+        # Bancos criados antes da coluna obs_count
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(products)")]
+        if 'obs_count' not in columns:
+            self.conn.executescript("""
+                ALTER TABLE products ADD COLUMN obs_count INTEGER NOT NULL DEFAULT 0;
+                UPDATE products SET obs_count =
+                    (SELECT COUNT(*) FROM prices WHERE prices.product_id = products.id);
+            """)
+        if 'last_cents' not in columns:
+            self.conn.executescript("""
+                ALTER TABLE products ADD COLUMN last_cents INTEGER;
+                UPDATE products SET last_cents =
+                    (SELECT cents FROM prices WHERE prices.product_id = products.id
+                     ORDER BY observed_at DESC LIMIT 1);
+            """)
+
+        # Bancos criados antes de price_levels: cada mudança conta como uma observação
+        if not self.conn.execute("SELECT 1 FROM price_levels LIMIT 1").fetchone():
+            self.conn.execute("""
+                INSERT INTO price_levels (product_id, cents, n)
+                SELECT product_id, cents, COUNT(*) FROM prices GROUP BY product_id, cents
+            """)
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def _product_id(self, key: str, create: bool = False) -> Optional[int]:
+        row = self.conn.execute("SELECT id FROM products WHERE key = ?", (key,)).fetchone()
+        if row:
+            return row[0]
+        if not create:
+            return None
+        return self.conn.execute("INSERT INTO products (key) VALUES (?)", (key,)).lastrowid
+
+    def record(self, key: str, cents: int, observed_at: Optional[int] = None) -> bool:
+        """Registra um preço observado; retorna False se for igual ao último"""
+        product_id = self._product_id(key, create=True)
+
+        # Toda observação conta para a mediana, mesmo repetida
+        self.conn.execute("""
+            INSERT INTO price_levels (product_id, cents, n) VALUES (?, ?, 1)
+            ON CONFLICT (product_id, cents) DO UPDATE SET n = n + 1
+        """, (product_id, cents))
+        changed = self._last(product_id) != cents
+        self.conn.execute(
+            "UPDATE products SET obs_count = obs_count + 1, last_cents = ? WHERE id = ?",
+            (cents, product_id)
+        )
+        if changed:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO prices (product_id, observed_at, cents) VALUES (?, ?, ?)",
+                (product_id, int(observed_at if observed_at is not None else time.time()), cents)
+            )
+        self.conn.commit()
+        return changed
+
+    def _last(self, product_id: int) -> Optional[int]:
+        row = self.conn.execute(
+            "SELECT last_cents FROM products WHERE id = ?", (product_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def stats(self, key: str) -> Optional[Dict]:
+        """Retorna mínimo, mediana (superior, ponderada), último preço e número de observações"""
+        row = self.conn.execute(
+            "SELECT id, obs_count, last_cents FROM products WHERE key = ?", (key,)
+        ).fetchone()
+        if not row or not row[1]:
+            return None
+        product_id, count, last_cents = row
+
+        # Percorre os preços em ordem até passar da metade das observações;
+        # com número par usa o valor superior ([250, 300] -> 300)
+        min_cents = median = None
+        seen = 0
+        levels = self.conn.execute(
+            "SELECT cents, n FROM price_levels WHERE product_id = ? ORDER BY cents", (product_id,)
+        )
+        for cents, n in levels:
+            if min_cents is None:
+                min_cents = cents
+            seen += n
+            if seen > count // 2:
+                median = cents
+                break
+
+        return {
+            'count': count,
+            'min': min_cents,
+            'median': median,
+            'last': last_cents,
+        }
+
+
+# Benchmark do histórico
+def benchmark_price_history(products: int = 10000, observations: int = 100):
+    import os
+    import random
+    import tempfile
+
+    db_file = os.path.join(tempfile.mkdtemp(), "price_history_bench.db")
+    history = PriceHistory(db_file)
+
+    start = time.perf_counter()
+    rows = []
+    levels = []
+    for product_id in range(1, products + 1):
+        # Preços variam entre poucos valores, como nas ofertas reais
+        prices = [random.randint(1000, 500000) for _ in range(10)]
+        counts = {}
+        for t in range(observations):
+            cents = random.choice(prices)
+            counts[cents] = counts.get(cents, 0) + 1
+            rows.append((product_id, t, cents))
+        levels.extend((product_id, cents, n) for cents, n in counts.items())
+        history.conn.execute(
+            "INSERT INTO products (id, key, obs_count, last_cents) VALUES (?, ?, ?, ?)",
+            (product_id, f"loja|produto {product_id}", observations, cents)
+        )
+    history.conn.executemany("INSERT INTO prices VALUES (?, ?, ?)", rows)
+    history.conn.executemany("INSERT INTO price_levels VALUES (?, ?, ?)", levels)
+    history.conn.commit()
+    print(f"{len(rows)} observações gravadas em {time.perf_counter() - start:.1f} s "
+          f"({os.path.getsize(db_file) / len(rows):.1f} bytes/observação)")
+
+    start = time.perf_counter()
+    for product_id in random.sample(range(1, products + 1), 1000):
+        history.stats(f"loja|produto {product_id}")
+    elapsed = time.perf_counter() - start
+    print(f"1000 consultas em {elapsed * 1000:.1f} ms ({elapsed:.2f} ms/consulta)")
+
+    history.close()
+
+
+if __name__ == '__main__':
+    benchmark_price_history()
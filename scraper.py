@@ -1,4 +1,5 @@
 import asyncio
+import itertools
 import json
 from playwright.async_api import async_playwright
 from datetime import datetime
@@ -8,14 +9,21 @@ import urllib.parse
 import aiohttp
 
 class PelandoScraper:
-    def __init__(self):
+    def __init__(self, feeds=None, max_concurrent_feeds=3):
         self.base_url = "https://www.pelando.com.br/"
+        # Páginas do Pelando raspadas em paralelo (ex: "/", "/recentes")
+        self.feeds = [urllib.parse.urljoin(self.base_url, feed) for feed in (feeds or ["/"])]
+        self.max_concurrent_feeds = max_concurrent_feeds
         self.affiliate_id_amazon = "SEU_ID_AFILIADO_AMAZON"
         self.affiliate_id_aliexpress = "SEU_ID_AFILIADO_ALIEXPRESS"
         self.affiliate_id_mercadolivre = "SEU_ID_AFILIADO_MERCADOLIVRE"
 
-    async def scrape_offers(self, max_offers=10):
-        """Extrai ofertas do site Pelando"""
+    async def scrape_offers(self, max_offers=10, skip_offer=None):
+        """Extrai ofertas do site Pelando.
+
+        skip_offer(offer) permite descartar ofertas (ex: já enviadas) antes
+        do limite max_offers, que vale para o total de todas as páginas.
+        """
         async with async_playwright() as p:
             user_data_dir = "./playwright_user_data"
             is_first_run = not os.path.exists(user_data_dir) or not os.listdir(user_data_dir)
@@ -40,12 +48,45 @@ class PelandoScraper:
                     print("Login concluído. Execute novamente.")
                     return []
                 
-                print("Acessando o site Pelando...")
-                page = await browser.new_page()
-                await page.goto(self.base_url, wait_until="networkidle")
-                await page.wait_for_selector("._deal-card_1jdb6_25", timeout=20000)
-                offers = await self._extract_offers(page, max_offers, browser)
-                print(f"Encontradas {len(offers)} ofertas")
+                # Lê os cards de cada página em abas paralelas do mesmo
+                # contexto, limitadas pelo semáforo
+                semaphore = asyncio.Semaphore(self.max_concurrent_feeds)
+                results = await asyncio.gather(*[
+                    self._scrape_feed(feed, browser, semaphore)
+                    for feed in self.feeds
+                ])
+                
+                # Intercala as páginas (1ª de cada, 2ª de cada, ...), remove
+                # repetidas e descartadas, e só então gera os links de
+                # afiliado para as max_offers primeiras
+                interleaved = (
+                    offer
+                    for round_offers in itertools.zip_longest(*results)
+                    for offer in round_offers
+                    if offer is not None
+                )
+                offers = []
+                seen_links = set()
+                for offer in interleaved:
+                    if len(offers) >= max_offers:
+                        break
+                    deal_url = offer['original_link']
+                    if deal_url:
+                        if deal_url in seen_links:
+                            continue
+                        seen_links.add(deal_url)
+                    if skip_offer and skip_offer(offer):
+                        continue
+                    
+                    offer['link'] = await self._generate_affiliate_link(
+                        offer['original_link'],
+                        offer['store'],
+                        self._clean_title(offer['title']),
+                        browser
+                    )
+                    offers.append(offer)
+                
+                print(f"Encontradas {len(offers)} ofertas em {len(self.feeds)} páginas")
                 return offers
 
             except Exception as e:
@@ -54,12 +95,27 @@ class PelandoScraper:
             finally:
                 await browser.close()
 
-    async def _extract_offers(self, page, max_offers, browser):
-        """Extrai informações das ofertas da página"""
+    async def _scrape_feed(self, feed_url, browser, semaphore):
+        """Lê as ofertas de uma página do Pelando em uma nova aba"""
+        async with semaphore:
+            page = await browser.new_page()
+            try:
+                print(f"Acessando {feed_url}...")
+                await page.goto(feed_url, wait_until="networkidle")
+                await page.wait_for_selector("._deal-card_1jdb6_25", timeout=20000)
+                return await self._extract_offers(page)
+            except Exception as e:
+                print(f"Erro ao fazer scraping de {feed_url}: {e}")
+                return []
+            finally:
+                await page.close()
+
+    async def _extract_offers(self, page):
+        """Extrai informações de todas as ofertas da página (sem link de afiliado)"""
         offers = []
         deal_cards = await page.query_selector_all("._deal-card_1jdb6_25")
         
-        for i, card in enumerate(deal_cards[:max_offers]):
+        for i, card in enumerate(deal_cards):
             try:
                 # Extrair título básico
                 title_element = await card.query_selector("._title_mszsg_31")
@@ -70,7 +126,7 @@ class PelandoScraper:
                     print(f"\n⚠️ Oferta de cupom ignorada: '{title}'")
                     continue
                     
-                offer = await self._extract_offer_data(card, browser)
+                offer = await self._extract_offer_data(card)
                 if offer:
                     offers.append(offer)
             except Exception as e:
@@ -79,28 +135,20 @@ class PelandoScraper:
                 
         return offers
 
-    async def _extract_offer_data(self, card, browser):
+    async def _extract_offer_data(self, card):
         """Extrai dados de uma oferta específica"""
         try:
             # Extração básica de dados
             title_element = await card.query_selector("._title_mszsg_31")
             title = await title_element.inner_text() if title_element else ""
-            clean_title = self._clean_title(title)
 
             link_element = await card.query_selector("._title_mszsg_31")
             original_link = await link_element.get_attribute("href") if link_element else ""
             if original_link and not original_link.startswith("http"):
                 original_link = f"https://www.pelando.com.br{original_link}"
 
-            # Gerar link de afiliado
             store_element = await card.query_selector("._container_13qz9_31 a")
             store = await store_element.inner_text() if store_element else ""
-            affiliate_link = await self._generate_affiliate_link(
-                original_link, 
-                store, 
-                clean_title,
-                browser
-            )
 
             # Extrair outros dados
             price_element = await card.query_selector("._deal-card-stamp_15l5n_25")
@@ -121,7 +169,7 @@ class PelandoScraper:
                 'store': store.strip(),
                 'temperature': temperature.strip(),
                 'timestamp': timestamp.strip(),
-                'link': affiliate_link,
+                'link': original_link,  # Trocado pelo link de afiliado em scrape_offers
                 'original_link': original_link,
                 'image_url': image_url,
                 'scraped_at': datetime.now().isoformat()
@@ -211,7 +259,7 @@ class PelandoScraper:
         ))
 
 async def main():
-    scraper = PelandoScraper()
+    scraper = PelandoScraper(feeds=["/", "/recentes"])
     offers = await scraper.scrape_offers(max_offers=5)
 
     print("\n=== RESULTADOS ===")
@@ -1,12 +1,15 @@
 import asyncio
 import aiohttp
-from typing import List, Dict
+from typing import List, Dict, Optional
+from message_formatter import OfferFormatter, DEFAULT_TEMPLATE, CAPTION_LIMIT, TEXT_LIMIT
 
 class TelegramBot:
-    def __init__(self, bot_token: str, chat_id: str):
+    def __init__(self, bot_token: str, chat_id: str, template: Optional[str] = None):
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        # Template pré-compilado por canal
+        self.formatter = OfferFormatter(template or DEFAULT_TEMPLATE)
     
     async def send_message(self, text: str, parse_mode: str = "HTML"):
         """Envia uma mensagem de texto para o canal"""
@@ -58,31 +61,25 @@ class TelegramBot:
                 print(f"Erro na requisição: {e}")
                 return False
     
-    def format_offer_message(self, offer: Dict) -> str:
+    def format_offer_message(self, offer: Dict, limit: int = TEXT_LIMIT) -> Optional[str]:
         """Formata uma oferta para envio no Telegram"""
-        message = f"""🔥 <b>{offer['title']}</b>
-
-💰 <b>Preço:</b> {offer['price']}
-🏪 <b>Loja:</b> {offer['store']}
-🌡️ <b>Temperatura:</b> {offer['temperature']}
-⏰ <b>Postado:</b> {offer['timestamp']}
-
-🔗 <a href="{offer['link']}">Ver oferta completa</a>
-
-#oferta #promocao #{offer['store'].lower().replace(' ', '')}"""
-        
-        return message
+        return self.formatter.format(offer, limit)
     
     async def send_offer(self, offer: Dict):
         """Envia uma oferta formatada para o canal"""
-        message = self.format_offer_message(offer)
-        
         # Se há imagem, envia como foto com legenda
         if offer.get('image_url'):
-            return await self.send_photo(offer['image_url'], message)
-        else:
-            # Senão, envia apenas como mensagem de texto
-            return await self.send_message(message)
+            caption = self.format_offer_message(offer, CAPTION_LIMIT)
+            if caption is not None:
+                return await self.send_photo(offer['image_url'], caption)
+            print("Legenda excede o limite da foto, enviando como mensagem de texto")
+        
+        # Senão, envia apenas como mensagem de texto
+        message = self.format_offer_message(offer, TEXT_LIMIT)
+        if message is None:
+            print(f"Oferta ignorada, mensagem excede o limite: '{offer.get('title', '')[:50]}'")
+            return False
+        return await self.send_message(message)
     
     async def send_offers_batch(self, offers: List[Dict], delay: int = 2):
         """Envia múltiplas ofertas com delay entre elas"""